@@ -1,24 +1,124 @@
 import os
+import argparse
+import shutil
+import duckdb
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from pathlib import Path
 import logging
+import logging.handlers
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional
 import re
+import unicodedata
 from datetime import datetime
 
+try:
+    import numexpr
+except ImportError:  # optional: fuses the outlier masks into a single pass
+    numexpr = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # optional: compiles the per-cell fallback parser
+    njit = None
+    prange = range
+
+# Consolidator used by worker processes (set by _init_worker)
+_worker_consolidator = None
+
+
+def _init_worker(consolidator: 'SoilDataConsolidator', log_queue: multiprocessing.Queue):
+    """Store the consolidator and route worker log records to the main process"""
+    global _worker_consolidator
+    _worker_consolidator = consolidator
+
+    root_logger = logging.getLogger()
+    root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root_logger.setLevel(logging.INFO)
+
+
+def _process_one(task: Tuple[Path, str, str]) -> Optional[pd.DataFrame]:
+    """Process a single CSV file in a worker process"""
+    file_path, nutrient_type, run_ts = task
+    return _worker_consolidator.process_single_file(file_path, nutrient_type, run_ts)
+
+
+def _parse_leading_numbers(chars: np.ndarray) -> np.ndarray:
+    """
+    Parse the first number found in each row of a null-padded byte matrix
+
+    Args:
+        chars: 2-D uint8 array, one ASCII string per row
+
+    Returns:
+        float64 array with the first number of each row, NaN where none is found
+    """
+    n_rows, width = chars.shape
+    out = np.empty(n_rows, dtype=np.float64)
+    for i in prange(n_rows):
+        out[i] = np.nan
+        # Find the first digit, or a '.' directly followed by a digit
+        start = -1
+        for j in range(width):
+            c = chars[i, j]
+            if c == 0:
+                break
+            if 48 <= c <= 57 or (c == 46 and j + 1 < width and 48 <= chars[i, j + 1] <= 57):
+                start = j
+                break
+        if start < 0:
+            continue
+
+        value = 0.0
+        scale = 1.0
+        seen_dot = False
+        j = start
+        while j < width:
+            c = chars[i, j]
+            if 48 <= c <= 57:
+                if seen_dot:
+                    scale /= 10.0
+                    value += (c - 48) * scale
+                else:
+                    value = value * 10.0 + (c - 48)
+            elif c == 46 and not seen_dot:
+                seen_dot = True
+            else:
+                break
+            j += 1
+
+        # Keep a minus sign written directly before the number
+        if start > 0 and chars[i, start - 1] == 45:
+            value = -value
+        out[i] = value
+    return out
+
+
+if njit is not None:
+    _parse_leading_numbers = njit(parallel=True, cache=True)(_parse_leading_numbers)
+
 
 class SoilDataConsolidator:
-    def __init__(self, raw_data_path: str = "data/raw", processed_data_path: str = "data/processed"):
+    def __init__(self, raw_data_path: str = "data/raw", processed_data_path: str = "data/processed",
+                 max_workers: Optional[int] = None, batch_size: int = 50, use_numba: bool = False):
         """
         Initialize the consolidator with data paths
 
         Args:
             raw_data_path: Path to raw scraped data
             processed_data_path: Path to save processed data
+            max_workers: Worker processes for per-file processing (defaults to CPU count)
+            batch_size: Number of files processed per batch in per-file processing
+            use_numba: Re-parse garbled numeric values per cell (compiled with numba when installed)
         """
         self.raw_data_path = Path(raw_data_path)
         self.processed_data_path = Path(processed_data_path)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.use_numba = use_numba
 
         # Create processed directory if it doesn't exist
         self.processed_data_path.mkdir(parents=True, exist_ok=True)
@@ -54,6 +154,22 @@ class SoilDataConsolidator:
             'sulphur': ['s', 'S', 'sulphur', 'Sulphur', 'sulfur', 'Sulfur']
         }
 
+        # Patterns for extracting metadata from source file paths
+        self._path_sep_re = re.compile(r'[\\/]')
+        self._file_stem_re = re.compile(r'^.*[\\/]|\.[^.\\/]*$')
+        self._block_suffix_re = re.compile(r'_(macro|micro)(nutrient)?$', re.IGNORECASE)
+
+        # Columns with heavily repeated string values
+        self.categorical_columns = ['year', 'state', 'district', 'block', 'village', 'farmer_name',
+                                    'nutrient_type', 'source_file', 'processed_date']
+
+        # Reverse mapping (lowercase variation -> standard name) for faster lookup
+        self._reverse_mapping = {
+            variation.lower(): standard_name
+            for standard_name, variations in self.column_mappings.items()
+            for variation in variations
+        }
+
         # Standard data types for columns
         self.column_dtypes = {
             'year': 'str',
@@ -81,6 +197,23 @@ class SoilDataConsolidator:
             'sulphur': 'float64'
         }
 
+        # Text columns use Arrow-backed strings; numeric columns stay NumPy float64
+        # so outlier handling can work on them in place
+        self._string_dtype = pd.StringDtype('pyarrow')
+        self._arrow_types = {pa.string(): self._string_dtype, pa.large_string(): self._string_dtype}
+
+        # Columns holding numeric measurements
+        self.numeric_columns = ['ph', 'ec', 'oc', 'nitrogen', 'phosphorus', 'potassium',
+                                'iron', 'manganese', 'copper', 'zinc', 'boron', 'sulphur', 'area_hectare']
+
+        # Characters stripped from numeric columns before parsing (shared by pandas and DuckDB)
+        self._non_numeric_pattern = r'[^\d.\-]|--+'
+        self._non_numeric_re = re.compile(self._non_numeric_pattern)
+
+        # Share of digit-bearing values lost by the vectorized cleaner that
+        # triggers the per-cell fallback parser (only when use_numba is set)
+        self.garbled_fallback_threshold = 0.2
+
     def setup_logging(self):
         """Setup logging configuration"""
         log_file = self.processed_data_path / 'consolidation.log'
@@ -108,137 +241,204 @@ class SoilDataConsolidator:
             return csv_files
 
         # Walk through all directories
-        for root, dirs, files in os.walk(self.raw_data_path):
-            for file in files:
-                if file.endswith('.csv'):
-                    file_path = Path(root) / file
-
-                    # Determine nutrient type from filename
-                    if 'macro' in file.lower():
-                        csv_files['macro'].append((file_path, 'macro'))
-                    elif 'micro' in file.lower():
-                        csv_files['micro'].append((file_path, 'micro'))
-                    else:
-                        # Try to determine from directory structure or content
-                        self.logger.warning(f"Could not determine nutrient type for: {file_path}")
+        for file_path in self.raw_data_path.rglob('*.csv'):
+            # Determine nutrient type from filename
+            file_name = file_path.name.lower()
+            if 'macro' in file_name:
+                csv_files['macro'].append((file_path, 'macro'))
+            elif 'micro' in file_name:
+                csv_files['micro'].append((file_path, 'micro'))
+            else:
+                self.logger.warning(f"Could not determine nutrient type for: {file_path}")
 
         self.logger.info(f"Found {len(csv_files['macro'])} macro files and {len(csv_files['micro'])} micro files")
         return csv_files
 
     def standardize_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Standardize column names using the column mappings
+        Standardize column names using the column mappings (mutates input)
+
+        Header variants that map to the same standard name (e.g. 'N' and
+        'Nitrogen') are merged into one column, keeping the first non-null value.
 
         Args:
-            df: Input DataFrame
+            df: Input DataFrame, renamed in place
 
         Returns:
-            DataFrame with standardized column names
+            The same DataFrame with standardized column names
         """
-        df_copy = df.copy()
-        original_columns = df_copy.columns.tolist()
-
-        # Create reverse mapping for faster lookup
-        reverse_mapping = {}
-        for standard_name, variations in self.column_mappings.items():
-            for variation in variations:
-                reverse_mapping[variation.lower()] = standard_name
-
-        # Rename columns
-        new_columns = []
-        for col in original_columns:
-            standard_name = reverse_mapping.get(col.lower(), col.lower())
-            new_columns.append(standard_name)
+        df.rename(columns=lambda col: self._reverse_mapping.get(col.lower(), col.lower()), inplace=True)
 
-        df_copy.columns = new_columns
-        return df_copy
+        for col in df.columns[df.columns.duplicated()].unique():
+            loc = list(df.columns).index(col)
+            merged = df[col].bfill(axis=1).iloc[:, 0]
+            df.drop(columns=col, inplace=True)
+            df.insert(loc, col, merged)
+        return df
 
-    def extract_metadata_from_path(self, file_path: Path) -> Dict[str, str]:
+    def extract_metadata_from_paths(self, source_files: pd.Series) -> pd.DataFrame:
         """
-        Extract metadata (year, state, district, block) from file path
+        Extract metadata (year, state, district, block) from source file paths
+
+        The string operations run once over the unique paths and are then
+        broadcast back to every row.
 
         Args:
-            file_path: Path to CSV file
+            source_files: Series of CSV paths relative to the raw data directory
 
         Returns:
-            Dictionary with metadata
+            DataFrame with metadata columns aligned to source_files
         """
-        parts = file_path.parts
-        metadata = {}
-
-        try:
-            # Find the raw data index
-            raw_index = None
-            for i, part in enumerate(parts):
-                if part == 'raw':
-                    raw_index = i
-                    break
-
-            if raw_index is not None and len(parts) > raw_index + 4:
-                metadata['year'] = parts[raw_index + 1]
-                metadata['state'] = parts[raw_index + 2].replace('_', ' ').replace('-', '/')
-                metadata['district'] = parts[raw_index + 3].replace('_', ' ').replace('-', '/')
-
-                # Extract block name from filename (remove nutrient type suffix)
-                filename = file_path.stem
-                block_name = re.sub(r'_(macro|micro)nutrient$', '', filename, flags=re.IGNORECASE)
-                block_name = re.sub(r'_(macro|micro)$', '', block_name, flags=re.IGNORECASE)
-                metadata['block'] = block_name.replace('_', ' ').replace('-', '/')
-
-        except (IndexError, AttributeError) as e:
-            self.logger.warning(f"Could not extract metadata from path {file_path}: {e}")
-
+        codes, unique_files = pd.factorize(source_files)
+        unique_files = pd.Series(unique_files, dtype=object)
+
+        # Expected layout: YEAR/STATE/DISTRICT/<block>_<nutrient>.csv
+        parts = unique_files.str.split(self._path_sep_re, expand=True)
+        if parts.shape[1] < 4:
+            self.logger.warning("Could not extract metadata from source file paths")
+            return pd.DataFrame(index=source_files.index)
+
+        # Extract block name from filename (remove extension and nutrient type suffix)
+        block = unique_files.str.replace(self._file_stem_re, '', regex=True)
+        block = block.str.replace(self._block_suffix_re, '', regex=True)
+
+        metadata = pd.DataFrame({
+            'year': parts[0],
+            'state': parts[1].str.replace('_', ' ').str.replace('-', '/'),
+            'district': parts[2].str.replace('_', ' ').str.replace('-', '/'),
+            'block': block.str.replace('_', ' ').str.replace('-', '/')
+        }).where(parts[3].notna())
+
+        # Broadcast back to rows (code -1 marks a missing path and maps to NaN)
+        metadata = metadata.reindex(codes)
+        metadata.index = source_files.index
         return metadata
 
     def clean_numeric_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Clean and standardize numeric columns
+        Clean and standardize numeric columns (mutates input)
 
         Args:
-            df: Input DataFrame
+            df: Input DataFrame, cleaned in place
 
         Returns:
-            DataFrame with cleaned numeric columns
+            The same DataFrame with cleaned numeric columns
+        """
+        for col in self.numeric_columns:
+            if col in df.columns:
+                # Columns the CSV reader already parsed as numbers need no cleaning
+                if not pd.api.types.is_numeric_dtype(df[col]):
+                    # Strip non-numeric characters in one pass; leftovers such as
+                    # '' or '-' become NaN in to_numeric
+                    raw = df[col].astype(str)
+                    values = raw.str.replace(self._non_numeric_re, '', regex=True)
+                    cleaned = pd.to_numeric(values, errors='coerce')
+                    if self.use_numba:
+                        cleaned = self.reparse_garbled_values(raw.where(df[col].notna()), cleaned, col)
+                    df[col] = cleaned
+
+        # Handle outliers (values that are clearly wrong) on all columns at once
+        # Nutrients and area should be non-negative
+        non_negative_columns = [col for col in self.numeric_columns if col != 'ph' and col in df.columns]
+        if non_negative_columns:
+            values = df[non_negative_columns].to_numpy(dtype=np.float64, copy=True)
+            if numexpr is not None:
+                numexpr.evaluate('where(a < 0, nan, a)', local_dict={'a': values, 'nan': np.nan},
+                                 out=values, casting='unsafe')
+            else:
+                np.putmask(values, values < 0, np.nan)
+            df[non_negative_columns] = values
+
+        # pH should be between 0 and 14
+        if 'ph' in df.columns:
+            ph = df['ph'].to_numpy(dtype=np.float64, copy=True)
+            if numexpr is not None:
+                numexpr.evaluate('where((ph < 0) | (ph > 14), nan, ph)',
+                                 local_dict={'ph': ph, 'nan': np.nan}, out=ph, casting='unsafe')
+            else:
+                np.putmask(ph, (ph < 0) | (ph > 14), np.nan)
+            df['ph'] = ph
+
+        return df
+
+    def reparse_garbled_values(self, raw: pd.Series, cleaned: pd.Series, col: str) -> pd.Series:
         """
-        df_copy = df.copy()
+        Re-parse values the vectorized cleaner could not recover (e.g. '5-10', '1.2.3')
 
-        # Define numeric columns that should be cleaned
-        numeric_columns = ['ph', 'ec', 'oc', 'nitrogen', 'phosphorus', 'potassium',
-                           'iron', 'manganese', 'copper', 'zinc', 'boron', 'sulphur', 'area_hectare']
+        Only runs when the share of digit-bearing values that came out as NaN
+        exceeds garbled_fallback_threshold; those cells take the first number
+        found in the original string. Non-ASCII digits (e.g. Devanagari) are
+        read as their ASCII equivalents.
 
-        for col in numeric_columns:
-            if col in df_copy.columns:
-                # Convert to string first to handle mixed types
-                df_copy[col] = df_copy[col].astype(str)
+        Args:
+            raw: Original values as strings (NaN where missing)
+            cleaned: Result of the vectorized cleaner
+            col: Column name, for logging
 
-                # Remove common non-numeric characters
-                df_copy[col] = df_copy[col].str.replace(r'[^\d.-]', '', regex=True)
-                df_copy[col] = df_copy[col].str.replace(r'--+', '', regex=True)  # Remove multiple dashes
+        Returns:
+            Cleaned values with garbled cells re-parsed
+        """
+        # Map non-ASCII digits to ASCII so the byte parser does not drop them
+        non_ascii = raw.str.contains(r'[^\x00-\x7f]', na=False)
+        if non_ascii.any():
+            raw = raw.mask(non_ascii, raw[non_ascii].str.replace(
+                r'\d', lambda m: str(unicodedata.digit(m.group(0))), regex=True))
+
+        has_digit = raw.str.contains(r'\d', na=False)
+        garbled = has_digit & cleaned.isna()
+        n_garbled = int(garbled.sum())
+        if n_garbled == 0 or n_garbled <= self.garbled_fallback_threshold * int(has_digit.sum()):
+            return cleaned
+
+        encoded = raw[garbled].str.encode('ascii', errors='ignore')
+        chars = np.array(encoded.tolist(), dtype=bytes)
+        chars = chars.view(np.uint8).reshape(len(chars), -1)
+
+        cleaned = cleaned.astype(np.float64)
+        cleaned[garbled] = _parse_leading_numbers(chars)
+        self.logger.info(f"Re-parsed {n_garbled} garbled values in column {col}")
+        return cleaned
+
+    def read_csv_file(self, file_path: Path, encoding: str) -> pd.DataFrame:
+        """
+        Read a CSV file, parsing known numeric columns as float64 directly
 
-                # Replace empty strings and common missing value indicators
-                df_copy[col] = df_copy[col].replace(['', '-', 'NA', 'N/A', 'null', 'NULL', 'None'], np.nan)
+        Files whose numeric columns hold non-numeric text are re-read without
+        declared dtypes and cleaned by clean_numeric_columns instead.
 
-                # Convert to numeric
-                df_copy[col] = pd.to_numeric(df_copy[col], errors='coerce')
+        Args:
+            file_path: Path to CSV file
+            encoding: File encoding
 
-                # Handle outliers (values that are clearly wrong)
-                if col == 'ph':
-                    df_copy[col] = df_copy[col].where((df_copy[col] >= 0) & (df_copy[col] <= 14))
-                elif col == 'area_hectare':
-                    df_copy[col] = df_copy[col].where(df_copy[col] >= 0)
-                elif col in ['nitrogen', 'phosphorus', 'potassium', 'iron', 'manganese', 'copper', 'zinc', 'boron',
-                             'sulphur']:
-                    df_copy[col] = df_copy[col].where(df_copy[col] >= 0)  # Nutrients should be non-negative
+        Returns:
+            DataFrame as read from the file
+        """
+        header = pd.read_csv(file_path, encoding=encoding, nrows=0).columns
+        numeric_columns = [col for col in header
+                           if self._reverse_mapping.get(col.lower(), col.lower()) in self.numeric_columns]
 
-        return df_copy
+        if numeric_columns:
+            try:
+                return pd.read_csv(file_path, encoding=encoding,
+                                   dtype={col: 'float64' for col in numeric_columns},
+                                   na_values={col: ['-'] for col in numeric_columns})
+            except UnicodeDecodeError:
+                # A ValueError too, but left to the caller's encoding fallback
+                raise
+            except ValueError:
+                self.logger.info(f"Non-numeric values in numeric columns of {file_path}, cleaning as text")
 
-    def process_single_file(self, file_path: Path, nutrient_type: str) -> Optional[pd.DataFrame]:
+        return pd.read_csv(file_path, encoding=encoding)
+
+    def process_single_file(self, file_path: Path, nutrient_type: str,
+                            run_ts: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
         Process a single CSV file
 
         Args:
             file_path: Path to CSV file
             nutrient_type: Type of nutrient data ('macro' or 'micro')
+            run_ts: Processing timestamp shared by the whole run (defaults to now)
 
         Returns:
             Processed DataFrame or None if processing failed
@@ -246,9 +446,9 @@ class SoilDataConsolidator:
         try:
             # Read CSV with error handling
             try:
-                df = pd.read_csv(file_path, encoding='utf-8')
+                df = self.read_csv_file(file_path, encoding='utf-8')
             except UnicodeDecodeError:
-                df = pd.read_csv(file_path, encoding='latin-1')
+                df = self.read_csv_file(file_path, encoding='latin-1')
             except Exception as e:
                 self.logger.error(f"Could not read {file_path}: {e}")
                 return None
@@ -260,13 +460,6 @@ class SoilDataConsolidator:
             # Standardize column names
             df = self.standardize_column_names(df)
 
-            # Extract metadata from file path
-            metadata = self.extract_metadata_from_path(file_path)
-
-            # Add metadata columns
-            for key, value in metadata.items():
-                df[key] = value
-
             # Add nutrient type
             df['nutrient_type'] = nutrient_type
 
@@ -275,7 +468,7 @@ class SoilDataConsolidator:
 
             # Add source file information
             df['source_file'] = str(file_path.relative_to(self.raw_data_path))
-            df['processed_date'] = datetime.now().isoformat()
+            df['processed_date'] = run_ts or datetime.now().isoformat()
 
             self.logger.info(f"Processed {file_path}: {len(df)} rows")
             return df
@@ -284,6 +477,284 @@ class SoilDataConsolidator:
             self.logger.error(f"Error processing {file_path}: {e}")
             return None
 
+    def column_sql(self, standard_name: str, columns: List[Tuple[str, str]], mask_outliers: bool = True) -> str:
+        """
+        Build the SELECT expression that standardizes and cleans one output column
+
+        Mirrors standardize_column_names and clean_numeric_columns in SQL. Header
+        variants unioned as separate columns (e.g. 'N' and 'Nitrogen') are merged
+        into the standard column with COALESCE.
+
+        Args:
+            standard_name: Standard column name
+            columns: (column name, DuckDB type) of every scanned column mapping to it
+            mask_outliers: Null out-of-range numeric values (left to pandas when
+                garbled values are re-parsed after the scan)
+
+        Returns:
+            SQL expression aliased to the standard column name
+        """
+        values = ['"{}"'.format(column.replace('"', '""')) for column, _ in columns]
+
+        if standard_name in self.numeric_columns:
+            values = [f"TRY_CAST(regexp_replace({value}, '{self._non_numeric_pattern}', '', 'g') AS DOUBLE)"
+                      if column_type == 'VARCHAR' else f"CAST({value} AS DOUBLE)"
+                      for value, (_, column_type) in zip(values, columns)]
+        elif len({column_type for _, column_type in columns}) > 1:
+            values = [f"CAST({value} AS VARCHAR)" for value in values]
+
+        value = values[0] if len(values) == 1 else f"COALESCE({', '.join(values)})"
+
+        if standard_name in self.numeric_columns and mask_outliers:
+            # Handle outliers (values that are clearly wrong)
+            if standard_name == 'ph':
+                value = f"CASE WHEN {value} BETWEEN 0 AND 14 THEN {value} END"
+            else:
+                value = f"CASE WHEN {value} >= 0 THEN {value} END"
+
+        return '{} AS "{}"'.format(value, standard_name.replace('"', '""'))
+
+    def read_staged_files(self, staged_files: List[Path]) -> pd.DataFrame:
+        """
+        Load staged Parquet files into a single DataFrame
+
+        The files are read into one Arrow table, whose buffers are released
+        column by column while it is converted, so loading peaks at roughly
+        one copy of the data rather than two.
+
+        Args:
+            staged_files: Parquet files written while processing one nutrient type
+
+        Returns:
+            Combined DataFrame with columns unioned by name
+        """
+        with duckdb.connect() as con:
+            result = pa.table(con.execute(
+                "SELECT * FROM read_parquet($files, union_by_name = true)",
+                {'files': [str(f) for f in staged_files]}
+            ).arrow())
+        return result.to_pandas(types_mapper=self._arrow_types.get, self_destruct=True, split_blocks=True)
+
+    def read_nutrient_files(self, file_paths: List[Path], staging_dir: Path) -> Optional[pd.DataFrame]:
+        """
+        Read many CSV files in a single batched DuckDB scan
+
+        Columns are unioned by name across files, merged under their standard
+        names, and numeric columns are cleaned inside the query. A 'filename'
+        column records the source path of every row. The scan may spill to the
+        staging directory and its result is streamed there as Parquet before
+        being loaded, so DuckDB and pandas never hold the data at the same time.
+
+        The scan is strict about the layout: every file must use its first line
+        as header and have rows of that width. If the scanned columns differ
+        from the file headers (e.g. the sniffer took a ragged row as header),
+        the batch is rejected so the files are processed individually.
+
+        Args:
+            file_paths: Paths to CSV files of one nutrient type
+            staging_dir: Directory for spill and staged files
+
+        Returns:
+            Combined DataFrame or None if the batched scan failed
+        """
+        try:
+            headers = set()
+            for file_path in file_paths:
+                headers.update(pd.read_csv(file_path, encoding='utf-8', nrows=0).columns)
+        except (UnicodeDecodeError, ValueError) as e:
+            self.logger.warning(f"Could not read headers for batched scan: {e}")
+            return None
+
+        scan = """
+            CREATE TEMP TABLE scan AS SELECT * FROM read_csv(
+                $paths, header = true, skip = 0, delim = ',', strict_mode = true, null_padding = false,
+                filename = true, union_by_name = true,
+                sample_size = -1, auto_type_candidates = ['BIGINT', 'DOUBLE', 'VARCHAR']
+            )
+        """
+        staged_file = staging_dir / 'scan.parquet'
+        try:
+            with duckdb.connect(config={'temp_directory': str(staging_dir)}) as con:
+                con.execute(scan, {'paths': [str(p) for p in file_paths]})
+                columns = con.execute("SELECT column_name, column_type FROM (DESCRIBE scan)").fetchall()
+
+                mismatched = ({column for column, _ in columns} - {'filename'}) ^ headers
+                if mismatched:
+                    self.logger.warning(f"Batched scan of {len(file_paths)} files does not match the file "
+                                        f"headers: {sorted(mismatched)}")
+                    return None
+
+                # Group scanned columns by standard name, in order of first appearance
+                groups = {}
+                for column, column_type in columns:
+                    standard_name = self._reverse_mapping.get(column.lower(), column.lower())
+                    groups.setdefault(standard_name, []).append((column, column_type))
+
+                # With use_numba, text numeric columns also keep their raw strings so
+                # garbled values can be re-parsed as in clean_numeric_columns
+                reparse_columns = [standard_name for standard_name, columns in groups.items()
+                                   if self.use_numba and standard_name in self.numeric_columns
+                                   and any(column_type == 'VARCHAR' for _, column_type in columns)]
+
+                select = [self.column_sql(standard_name, columns, mask_outliers=standard_name not in reparse_columns)
+                          for standard_name, columns in groups.items()]
+                for standard_name in reparse_columns:
+                    values = ['CAST("{}" AS VARCHAR)'.format(column.replace('"', '""'))
+                              for column, _ in groups[standard_name]]
+                    select.append('COALESCE({}) AS "{}"'.format(
+                        ', '.join(values), f'{standard_name}__raw'.replace('"', '""')))
+
+                target = str(staged_file).replace("'", "''")
+                con.execute(f"COPY (SELECT {', '.join(select)} FROM scan) TO '{target}' (FORMAT PARQUET)")
+        except duckdb.Error as e:
+            self.logger.warning(f"Batched scan of {len(file_paths)} files failed: {e}")
+            return None
+
+        df = self.read_staged_files([staged_file])
+        if reparse_columns:
+            # The fallback threshold applies per source file, as in process_single_file
+            file_rows = df.groupby('filename', sort=False, observed=True).indices.values()
+            for col in reparse_columns:
+                raw, cleaned = df.pop(f'{col}__raw'), df[col]
+                df[col] = pd.concat([self.reparse_garbled_values(raw.iloc[rows], cleaned.iloc[rows], col)
+                                     for rows in file_rows])
+            # Numeric columns are parsed by now, so only outliers are handled
+            df = self.clean_numeric_columns(df)
+        return df
+
+    def process_files_individually(self, file_paths: List[Path], nutrient_type: str, run_ts: str,
+                                   staging_dir: Path) -> pd.DataFrame:
+        """
+        Process CSV files one by one with process_single_file, in parallel batches
+
+        Each finished batch is written to the staging directory as Parquet, so
+        only one batch of per-file frames is held in memory while processing;
+        the combined result is loaded once all batches are staged.
+
+        Args:
+            file_paths: Paths to CSV files of one nutrient type
+            nutrient_type: Type of nutrient data ('macro' or 'micro')
+            run_ts: Processing timestamp shared by the whole run
+            staging_dir: Directory for staged batch files
+
+        Returns:
+            Combined processed DataFrame (empty if nothing could be processed)
+        """
+        tasks = [(file_path, nutrient_type, run_ts) for file_path in file_paths]
+        batches = [tasks[i:i + self.batch_size] for i in range(0, len(tasks), self.batch_size)]
+        staged_files = []
+
+        def collect(results):
+            dataframes = [df for df in results if df is not None]
+            if dataframes:
+                batch_df = pd.concat(dataframes, ignore_index=True, sort=False)
+                # Text columns may mix types across files; store them as strings
+                text_columns = batch_df.select_dtypes(include=['object', 'string']).columns
+                batch_df = batch_df.astype({col: self._string_dtype for col in text_columns})
+
+                staged_file = staging_dir / f'part-{len(staged_files):05d}.parquet'
+                batch_df.to_parquet(staged_file, engine='pyarrow', index=False)
+                staged_files.append(staged_file)
+
+        if self.max_workers > 1 and len(tasks) > 1:
+            log_queue = multiprocessing.Queue()
+            listener = logging.handlers.QueueListener(log_queue, *logging.getLogger().handlers,
+                                                      respect_handler_level=True)
+            listener.start()
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(tasks)),
+                                         initializer=_init_worker, initargs=(self, log_queue)) as executor:
+                    for batch in batches:
+                        collect(executor.map(_process_one, batch))
+            finally:
+                listener.stop()
+        else:
+            for batch in batches:
+                collect(self.process_single_file(*task) for task in batch)
+
+        if not staged_files:
+            return pd.DataFrame()
+        return self.read_staged_files(staged_files)
+
+    def process_nutrient_files(self, files: List[Tuple[Path, str]], nutrient_type: str, run_ts: str) -> pd.DataFrame:
+        """
+        Process all CSV files of one nutrient type
+
+        Files are read and cleaned with one batched scan; if that fails (e.g. a file
+        is not valid UTF-8) every file is processed individually with process_single_file.
+
+        Args:
+            files: List of (file_path, nutrient_type) tuples
+            nutrient_type: Type of nutrient data ('macro' or 'micro')
+            run_ts: Processing timestamp shared by the whole run
+
+        Returns:
+            Combined processed DataFrame (empty if nothing could be processed)
+        """
+        file_paths = []
+        for file_path, _ in files:
+            if file_path.stat().st_size == 0:
+                self.logger.warning(f"Empty file: {file_path}")
+            else:
+                file_paths.append(file_path)
+
+        # Intermediate results are staged on disk and removed once loaded
+        staging_dir = self.processed_data_path / f'.staging_{nutrient_type}'
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+        try:
+            df = self.read_nutrient_files(file_paths, staging_dir) if file_paths else None
+            batched = df is not None
+            if not batched:
+                df = self.process_files_individually(file_paths, nutrient_type, run_ts, staging_dir)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        if df.empty:
+            return pd.DataFrame()
+
+        if batched:
+            filenames = df.pop('filename')
+
+            # Column names and numeric values were already standardized by the scan
+            df['nutrient_type'] = nutrient_type
+
+            # Add source file information
+            source_files = {str(p): str(p.relative_to(self.raw_data_path)) for p in file_paths}
+            df['source_file'] = filenames.map(source_files)
+            df['processed_date'] = run_ts
+
+        # Add metadata columns (placed ahead of nutrient_type)
+        metadata = self.extract_metadata_from_paths(df['source_file'])
+        for key in metadata.columns:
+            if key in df.columns:
+                df[key] = metadata[key]
+            else:
+                df.insert(df.columns.get_loc('nutrient_type'), key, metadata[key])
+
+        self.logger.info(f"Processed {len(file_paths)} {nutrient_type} files: {len(df)} rows")
+        return df
+
+    def convert_to_categorical(self, *dfs: pd.DataFrame):
+        """
+        Convert repeated-string columns to category dtype in place
+
+        All DataFrames passed together share one set of categories per column,
+        so merging or concatenating them keeps the categorical codes.
+
+        Args:
+            dfs: DataFrames to convert
+        """
+        for col in self.categorical_columns:
+            frames = [df for df in dfs if col in df.columns]
+            if not frames:
+                continue
+
+            categories = pd.unique(np.concatenate([df[col].dropna().unique() for df in frames]))
+            dtype = pd.CategoricalDtype(categories)
+            for df in frames:
+                df[col] = df[col].astype(dtype)
+
     def combine_macro_micro_data(self, macro_df: pd.DataFrame, micro_df: pd.DataFrame) -> pd.DataFrame:
         """
         Combine macro and micro nutrient data based on common fields
@@ -311,27 +782,29 @@ class SoilDataConsolidator:
         else:
             self.logger.info(f"Merging on columns: {available_keys}")
 
-            # Perform outer join to keep all records
-            combined_df = pd.merge(
-                macro_df, micro_df,
-                on=available_keys,
-                how='outer',
-                suffixes=('_macro', '_micro')
-            )
-
-            # Resolve conflicts in duplicate columns
-            for col in combined_df.columns:
-                if col.endswith('_macro') or col.endswith('_micro'):
-                    base_col = col.replace('_macro', '').replace('_micro', '')
-                    if base_col not in available_keys:  # Don't touch key columns
-                        macro_col = f"{base_col}_macro"
-                        micro_col = f"{base_col}_micro"
-
-                        if macro_col in combined_df.columns and micro_col in combined_df.columns:
-                            # Combine values, preferring non-null values
-                            combined_df[base_col] = combined_df[macro_col].fillna(combined_df[micro_col])
-                            # Drop the suffixed columns
-                            combined_df = combined_df.drop([macro_col, micro_col], axis=1)
+            # Non-key columns present in both frames, resolved by preferring macro values
+            overlap = [col for col in macro_df.columns if col in micro_df.columns and col not in available_keys]
+            column_order = ([col for col in macro_df.columns if col not in overlap] +
+                            [col for col in micro_df.columns if col not in macro_df.columns] + overlap)
+
+            macro_indexed = macro_df.set_index(available_keys)
+            micro_indexed = micro_df.set_index(available_keys)
+
+            if macro_indexed.index.is_unique and micro_indexed.index.is_unique:
+                # Outer join that prefers non-null macro values in a single call
+                combined_df = macro_indexed.combine_first(micro_indexed).reset_index()
+            else:
+                # Duplicate keys need a many-to-many join; perform outer join to keep all records
+                combined_df = pd.merge(
+                    macro_df, micro_df,
+                    on=available_keys,
+                    how='outer',
+                    suffixes=('_macro', '_micro')
+                )
+                for col in overlap:
+                    combined_df[col] = combined_df[f"{col}_macro"].fillna(combined_df[f"{col}_micro"])
+
+            combined_df = combined_df[column_order]
 
         return combined_df
 
@@ -345,35 +818,37 @@ class SoilDataConsolidator:
         Returns:
             Dictionary with summary statistics
         """
+        # Distinct counts for the location columns in one call
+        location_counts = df[[col for col in ['district', 'block'] if col in df.columns]].nunique()
+
         stats = {
             'total_records': len(df),
             'total_unique_farmers': df['farmer_name'].nunique() if 'farmer_name' in df.columns else 0,
-            'years_covered': sorted(df['year'].unique().tolist()) if 'year' in df.columns else [],
-            'states_covered': sorted(df['state'].unique().tolist()) if 'state' in df.columns else [],
-            'districts_covered': df['district'].nunique() if 'district' in df.columns else 0,
-            'blocks_covered': df['block'].nunique() if 'block' in df.columns else 0,
+            'years_covered': sorted(df['year'].dropna().unique().tolist()) if 'year' in df.columns else [],
+            'states_covered': sorted(df['state'].dropna().unique().tolist()) if 'state' in df.columns else [],
+            'districts_covered': int(location_counts.get('district', 0)),
+            'blocks_covered': int(location_counts.get('block', 0)),
             'missing_data_summary': {}
         }
 
-        # Calculate missing data percentages
-        for col in df.columns:
-            missing_pct = (df[col].isnull().sum() / len(df)) * 100
-            if missing_pct > 0:
-                stats['missing_data_summary'][col] = round(missing_pct, 2)
+        # Calculate missing data percentages for all columns at once
+        missing_pct = (df.isna().mean() * 100).round(2)
+        stats['missing_data_summary'] = missing_pct[missing_pct > 0].to_dict()
 
-        # Nutrient value ranges
+        # Nutrient value ranges, computed with a single aggregation
         nutrient_cols = ['ph', 'ec', 'oc', 'nitrogen', 'phosphorus', 'potassium',
                          'iron', 'manganese', 'copper', 'zinc', 'boron', 'sulphur']
 
         stats['nutrient_ranges'] = {}
-        for col in nutrient_cols:
-            if col in df.columns and df[col].notna().any():
-                stats['nutrient_ranges'][col] = {
-                    'min': float(df[col].min()),
-                    'max': float(df[col].max()),
-                    'mean': float(df[col].mean()),
-                    'median': float(df[col].median())
-                }
+        present = [col for col in nutrient_cols if col in df.columns]
+        if present:
+            ranges = df[present].agg(['min', 'max', 'mean', 'median'])
+
+            # Columns without any values aggregate to NaN and are left out
+            stats['nutrient_ranges'] = {
+                col: {stat: float(value) for stat, value in ranges[col].items()}
+                for col in ranges.columns if ranges[col].notna().all()
+            }
 
         return stats
 
@@ -393,32 +868,20 @@ class SoilDataConsolidator:
             self.logger.error("No CSV files found in the raw data directory")
             return pd.DataFrame(), {}
 
-        # Process macro nutrient files
-        macro_dataframes = []
-        for file_path, nutrient_type in csv_files['macro']:
-            df = self.process_single_file(file_path, nutrient_type)
-            if df is not None:
-                macro_dataframes.append(df)
-
-        # Process micro nutrient files
-        micro_dataframes = []
-        for file_path, nutrient_type in csv_files['micro']:
-            df = self.process_single_file(file_path, nutrient_type)
-            if df is not None:
-                micro_dataframes.append(df)
-
-        # Combine all macro and micro dataframes separately
-        if macro_dataframes:
-            macro_combined = pd.concat(macro_dataframes, ignore_index=True, sort=False)
+        # One timestamp for the whole batch
+        run_ts = datetime.now().isoformat()
+
+        # Process macro and micro nutrient files separately
+        macro_combined = self.process_nutrient_files(csv_files['macro'], 'macro', run_ts)
+        if not macro_combined.empty:
             self.logger.info(f"Combined macro data: {len(macro_combined)} rows")
-        else:
-            macro_combined = pd.DataFrame()
 
-        if micro_dataframes:
-            micro_combined = pd.concat(micro_dataframes, ignore_index=True, sort=False)
+        micro_combined = self.process_nutrient_files(csv_files['micro'], 'micro', run_ts)
+        if not micro_combined.empty:
             self.logger.info(f"Combined micro data: {len(micro_combined)} rows")
-        else:
-            micro_combined = pd.DataFrame()
+
+        # Repeated strings become categoricals shared by both frames
+        self.convert_to_categorical(macro_combined, micro_combined)
 
         # Combine macro and micro data
         if not macro_combined.empty and not micro_combined.empty:
@@ -434,14 +897,18 @@ class SoilDataConsolidator:
             self.logger.error("No data was successfully processed")
             return pd.DataFrame(), {}
 
-        # Apply final data type conversions
+        # Apply final data type conversions, skipping columns that already have them
         for col, dtype in self.column_dtypes.items():
             if col in final_df.columns:
+                current = final_df[col].dtype
                 try:
                     if dtype == 'str':
-                        final_df[col] = final_df[col].astype(str)
+                        # Categorical columns already hold strings
+                        if current != self._string_dtype and not isinstance(current, pd.CategoricalDtype):
+                            final_df[col] = final_df[col].astype(self._string_dtype)
                     elif dtype == 'float64':
-                        final_df[col] = pd.to_numeric(final_df[col], errors='coerce')
+                        if current != np.float64:
+                            final_df[col] = pd.to_numeric(final_df[col], errors='coerce')
                 except Exception as e:
                     self.logger.warning(f"Could not convert column {col} to {dtype}: {e}")
 
@@ -451,23 +918,37 @@ class SoilDataConsolidator:
         self.logger.info(f"Data consolidation completed: {len(final_df)} total records")
         return final_df, summary_stats
 
-    def save_consolidated_data(self, df: pd.DataFrame, summary_stats: Dict):
+    def save_consolidated_data(self, df: pd.DataFrame, summary_stats: Dict, write_csv: bool = False):
         """
         Save the consolidated data and summary statistics
 
+        Data is written as Parquet: one consolidated file plus a dataset
+        partitioned by year.
+
         Args:
             df: Consolidated DataFrame
             summary_stats: Summary statistics dictionary
+            write_csv: Also write the legacy CSV outputs
         """
         if df.empty:
             self.logger.error("Cannot save empty DataFrame")
             return
 
+        # Repeated strings are stored dictionary-encoded
+        parquet_df = df.astype({col: 'category' for col in self.categorical_columns if col in df.columns})
+
         # Save main consolidated file
-        consolidated_file = self.processed_data_path / 'soil_health_consolidated.csv'
-        df.to_csv(consolidated_file, index=False)
+        consolidated_file = self.processed_data_path / 'soil_health_consolidated.parquet'
+        parquet_df.to_parquet(consolidated_file, engine='pyarrow', compression='zstd', index=False)
         self.logger.info(f"Saved consolidated data to: {consolidated_file}")
 
+        # Save a year-partitioned dataset (by_year/year=YYYY/) for easier analysis
+        if 'year' in df.columns:
+            year_dir = self.processed_data_path / 'by_year'
+            shutil.rmtree(year_dir, ignore_errors=True)
+            parquet_df.to_parquet(year_dir, engine='pyarrow', compression='zstd', partition_cols=['year'], index=False)
+            self.logger.info(f"Saved yearly data to: {year_dir}")
+
         # Save summary statistics
         summary_file = self.processed_data_path / 'consolidation_summary.txt'
         with open(summary_file, 'w') as f:
@@ -501,18 +982,29 @@ class SoilDataConsolidator:
 
         self.logger.info(f"Saved summary statistics to: {summary_file}")
 
-        # Save separate files by year for easier analysis
+        if not write_csv:
+            return
+
+        # Save legacy CSV outputs
+        consolidated_csv = self.processed_data_path / 'soil_health_consolidated.csv'
+        df.to_csv(consolidated_csv, index=False)
+        self.logger.info(f"Saved consolidated data to: {consolidated_csv}")
+
         if 'year' in df.columns:
-            for year in df['year'].unique():
-                if pd.notna(year):
-                    year_df = df[df['year'] == year]
-                    year_file = self.processed_data_path / f'soil_health_{year}.csv'
-                    year_df.to_csv(year_file, index=False)
-                    self.logger.info(f"Saved {year} data to: {year_file}")
+            # One partitioning pass; rows without a year are dropped by groupby
+            for year, year_df in df.groupby('year', sort=False, observed=True):
+                year_file = self.processed_data_path / f'soil_health_{year}.csv'
+                year_df.to_csv(year_file, index=False)
+                self.logger.info(f"Saved {year} data to: {year_file}")
 
 
 def main():
     """Main function to run the consolidation process"""
+    parser = argparse.ArgumentParser(description="Consolidate scraped soil health data")
+    parser.add_argument('--csv', action='store_true',
+                        help="also write the legacy CSV outputs (consolidated and per-year files)")
+    args = parser.parse_args()
+
     print("🚀 Starting Soil Health Data Consolidation...")
 
     # Initialize consolidator
@@ -523,7 +1015,7 @@ def main():
 
     if not consolidated_df.empty:
         # Save consolidated data
-        consolidator.save_consolidated_data(consolidated_df, summary_stats)
+        consolidator.save_consolidated_data(consolidated_df, summary_stats, write_csv=args.csv)
 
         print("\n✅ Consolidation Summary:")
         print(f"   📊 Total Records: {summary_stats['total_records']:,}")
@@ -534,9 +1026,11 @@ def main():
         print(f"   🏘️  Blocks: {summary_stats['blocks_covered']:,}")
 
         print(f"\n📁 Files saved in: data/processed/")
-        print("   - soil_health_consolidated.csv (main file)")
+        print("   - soil_health_consolidated.parquet (main file)")
         print("   - consolidation_summary.txt (statistics)")
-        print("   - soil_health_YYYY.csv (yearly files)")
+        print("   - by_year/year=YYYY/ (yearly Parquet partitions)")
+        if args.csv:
+            print("   - soil_health_consolidated.csv, soil_health_YYYY.csv (legacy CSV)")
         print("   - consolidation.log (processing log)")
 
     else:
@@ -1,40 +1,391 @@
 import os
 import time
+import atexit
 import csv
+import json
+import random
 import shutil
-import threading
+import logging
+import logging.handlers
+import multiprocessing
+import multiprocessing.util
+import queue
+from tqdm import tqdm
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, NoSuchElementException
+from selenium.common.exceptions import (TimeoutException, StaleElementReferenceException, NoSuchElementException,
+                                        WebDriverException)
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # optional: without it the download folder is polled
+    Observer = None
+    FileSystemEventHandler = object
+
+# Scraper owned by a block worker process (set by _init_block_worker)
+_block_scraper = None
+# Why the block worker could not start its scraper (set by _init_block_worker)
+_block_init_error = None
+
+
+def _init_block_worker(nutrient_type, headless, log_queue):
+    """Start a persistent browser for this block worker and route its log records to the listener"""
+    global _block_scraper, _block_init_error
+    if log_queue is not None:
+        root_logger = logging.getLogger()
+        root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+        root_logger.setLevel(logging.INFO)
+
+    # A failing initializer makes Pool respawn the worker forever, so failures are
+    # recorded here and reported for every task instead
+    scraper = None
+    try:
+        scraper = SoilHealthScraper(
+            nutrient_type, headless=headless,
+            download_dir=os.path.abspath(f"downloads/{nutrient_type}/worker-{os.getpid()}"))
+        scraper.select_nutrient_type()
+    except Exception as e:
+        _block_init_error = f"block worker setup failed: {e}"
+        logging.getLogger(__name__).error(f"❌ [{nutrient_type}] {_block_init_error}")
+        if scraper is not None:
+            scraper.close()
+        return
+
+    _block_scraper = scraper
+    # Pool workers skip atexit handlers, so quit the browser from a multiprocessing finalizer
+    multiprocessing.util.Finalize(_block_scraper, _block_scraper.close, exitpriority=10)
+
+
+def _scrape_block(task):
+    """Scrape one (year, state, district, block) in a block worker process"""
+    year_name, state_name, district_name, block_name = task
+    if _block_scraper is None:
+        return block_name, 'failed', _block_init_error
+    try:
+        status, result = _block_scraper.scrape_block(year_name, state_name, district_name, block_name)
+    except Exception as e:
+        status, result = 'failed', str(e)
+    return block_name, status, result
+
+
+class _DownloadHandler(FileSystemEventHandler):
+    """Put the names of finished .csv downloads on a queue"""
+
+    def __init__(self, download_queue):
+        super().__init__()
+        self.download_queue = download_queue
+
+    def _push(self, path):
+        # Chrome writes to a .crdownload file and renames it once the download completes
+        if path.endswith('.csv'):
+            self.download_queue.put(os.path.basename(path))
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._push(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._push(event.dest_path)
 
 
 class SoilHealthScraper:
-    def __init__(self, nutrient_type, chrome_port=None, skip_years=None):
+    def __init__(self, nutrient_type, chrome_port=None, skip_years=None, headless=True, progress_position=0,
+                 block_workers=1, log_queue=None, download_dir=None):
         self.nutrient_type = nutrient_type
         self.chrome_port = chrome_port
+        self.headless = headless
+        self.progress_position = progress_position
+        # Browsers scraping blocks of a district in parallel (1 scrapes them in this browser)
+        self.block_workers = block_workers
+        self.log_queue = log_queue
+        self._block_pool = None
+        self.logger = logging.getLogger(__name__)
         # Set years to skip (can be list of years or single year)
         self.skip_years = skip_years if skip_years else []
         if isinstance(self.skip_years, str):
             self.skip_years = [self.skip_years]
 
+        # Completed (year, state, district, block) downloads, persisted one per line
+        self.manifest_path = f"data/raw/.manifest_{nutrient_type}.jsonl"
+        self.done = self.load_manifest()
+
+        # Last saved (year, state, district, block), so a restarted run resumes where it stopped
+        self.cursor_path = f"data/raw/.cursor_{nutrient_type}.json"
+        self.cursor = self.load_cursor()
+
+        # Each scraper downloads into its own folder so parallel exports never collide
+        self.download_dir = download_dir or os.path.abspath(f"downloads/{nutrient_type}")
+        os.makedirs(self.download_dir, exist_ok=True)
+
+        # Watch the download folder so finished exports are picked up as soon as the OS reports them
+        self._downloads = queue.Queue()
+        self._download_observer = None
+        if Observer is not None:
+            self._download_observer = Observer()
+            self._download_observer.schedule(_DownloadHandler(self._downloads), self.download_dir)
+            self._download_observer.daemon = True
+            self._download_observer.start()
+
+        # (year, state, district) currently selected in this browser, used by scrape_block
+        self._selection = None
+
+        # Dropdown option texts keyed by parent selection: () for years, (year,) for
+        # states, (year, state) for districts and (year, state, district) for blocks
+        self._opts_cache = {}
+
+        # Requests the scraper never needs (only the page's text and data are read)
+        self.blocked_urls = ["*google-analytics.com*", "*googletagmanager.com*", "*facebook.net*",
+                             "*.png", "*.jpg", "*.jpeg", "*.gif", "*.woff*", "*.ttf"]
+
+        # One Chrome instance is reused for the whole run; it is only
+        # recreated when its session is lost (see _ensure_driver)
+        self.driver = None
+        self._create_driver()
+        atexit.register(self.close)
+
+        # CSS selectors (evaluated natively by the browser, unlike XPath)
+        self.combobox_css = "div[role='combobox'].MuiSelect-select"
+        self.listbox_css = "ul[role='listbox']"
+        self.option_css = "ul[role='listbox'] > li:not([aria-disabled='true'])"
+
+        # Positions of the year/state/district/block comboboxes among the page's comboboxes
+        self.year_dropdown = 2
+        self.state_dropdown = 3
+        self.district_dropdown = 4
+        self.block_dropdown = 5
+
+        # Text matches have no CSS equivalent, so these stay XPath
+        self.listbox_xpath = "//ul[@role='listbox']"
+        self._button_xpath = f"//button[contains(text(), '{nutrient_type}(Table View)')]"
+
+        # Characters replaced in state/district/block names to make them file-system safe
+        self._name_trans = str.maketrans({"/": "-", " ": "_"})
+
+        # Scripts that read the DOM in a single WebDriver round trip
+        # Built from option_css so the script and Selenium match the same option elements
+        self.option_texts_js = (
+            f"return Array.from(document.querySelectorAll({json.dumps(self.option_css)}))"
+            ".map(e => e.innerText.trim()).filter(Boolean);")
+        self.table_js = (
+            "const grid = arguments[0].closest('[role=\"grid\"]') || arguments[0];"
+            "return {"
+            "headers: Array.from(grid.querySelectorAll('.MuiDataGrid-columnHeader[data-field]'))"
+            ".map(h => h.innerText.trim()),"
+            "rows: Array.from(grid.querySelectorAll('.MuiDataGrid-row'))"
+            ".map(r => Array.from(r.querySelectorAll('.MuiDataGrid-cell[data-field]')).map(c => c.innerText.trim())),"
+            "rowCount: Number(grid.getAttribute('aria-rowcount')),"
+            "colCount: Number(grid.getAttribute('aria-colcount'))};")
+
+        # Last table read by scrape_table (all rows, with headers) for writing CSVs directly
+        self.last_table = None
+
+    def _create_driver(self):
+        """Start Chrome and open the piechart page"""
         # Setup Chrome with different ports to avoid conflicts
         chrome_options = webdriver.ChromeOptions()
-        if chrome_port:
-            chrome_options.add_argument(f"--remote-debugging-port={chrome_port}")
+        if self.chrome_port:
+            chrome_options.add_argument(f"--remote-debugging-port={self.chrome_port}")
+
+        # Only text is read from the page, so skip rendering work that isn't needed
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "download.default_directory": self.download_dir,
+            "download.prompt_for_download": False,
+        })
+        # Return from driver.get on DOMContentLoaded instead of waiting for every subresource
+        chrome_options.page_load_strategy = "eager"
 
         service = Service(r'C:\chromedriver-win64\chromedriver-win64\chromedriver.exe')
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
+
+        # Block analytics, trackers, images and fonts at the network layer before the first navigation
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+        except WebDriverException as e:
+            self.logger.warning(f"⚠️ [{self.nutrient_type}] Could not block URLs via CDP: {e}")
+
         self.driver.get("https://soilhealth.dac.gov.in/piechart")
         self.wait = WebDriverWait(self.driver, 20)
+        # Combobox elements by position, resolved once and re-resolved only when stale
+        self._dropdown_cache = {}
+
+    def _ensure_driver(self):
+        """Recreate the browser only if its session is gone; returns True if a new one was started"""
+        if self.driver is not None and self.driver.session_id is not None:
+            try:
+                self.driver.current_url  # Cheap round trip to check the session is alive
+                return False
+            except WebDriverException:
+                pass
+
+        self.logger.info(f"🔄 [{self.nutrient_type}] Browser session lost, starting a new one")
+        self._quit_driver()
+        self._create_driver()
+        return True
+
+    def close(self):
+        """Quit the browser and any block workers if still running (safe to call more than once)"""
+        if self._block_pool is not None:
+            self._block_pool.close()
+            self._block_pool.join()
+            self._block_pool = None
+        if self._download_observer is not None:
+            self._download_observer.stop()
+            self._download_observer = None
+        self._quit_driver()
+
+    def _quit_driver(self):
+        """Quit only the browser, keeping the block workers and download observer running"""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+
+    def select_nutrient_type(self):
+        """Click the table view button for this scraper's nutrient type"""
+        button = self.wait.until(EC.element_to_be_clickable((By.XPATH, self._button_xpath)))
+        button.click()
+        self._selection = None
+        # The view is re-rendered, so drop cached dropdowns; it is ready once the year dropdown can be used
+        self._dropdown_cache = {}
+        self._get_dropdown(self.year_dropdown)
+
+    def _get_dropdown(self, dropdown_index):
+        """Return the clickable combobox at a position, reusing the cached element while it is still attached"""
+        dropdown = self._dropdown_cache.get(dropdown_index)
+        if dropdown is not None:
+            try:
+                if dropdown.is_displayed() and dropdown.is_enabled():
+                    return dropdown
+            except StaleElementReferenceException:
+                pass
+
+        # Missing, stale or not usable yet: look it up again
+        def clickable_combobox(driver):
+            comboboxes = driver.find_elements(By.CSS_SELECTOR, self.combobox_css)
+            try:
+                if len(comboboxes) > dropdown_index and comboboxes[dropdown_index].is_displayed() \
+                        and comboboxes[dropdown_index].is_enabled():
+                    return comboboxes[dropdown_index]
+            except StaleElementReferenceException:
+                pass
+            return False
+
+        dropdown = self.wait.until(clickable_combobox)
+        self._dropdown_cache[dropdown_index] = dropdown
+        return dropdown
+
+    def close_dropdown(self):
+        """Close any open dropdown by clicking elsewhere and wait for the listbox to disappear"""
+        try:
+            self.driver.find_element(By.TAG_NAME, "body").click()
+            self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, self.listbox_css)))
+        except:
+            pass
+
+    def wait_for_table(self, timeout=10, poll_frequency=0.25, empty_quiet_time=1.0):
+        """Wait until the DataGrid has finished loading and its row count stops changing
+
+        The grid can be empty for a moment before the request for a new selection
+        lands, so an empty grid only counts as loaded once the "No rows" overlay is
+        shown and has stayed for empty_quiet_time seconds.
+        """
+        self.wait.until(EC.invisibility_of_element_located(
+            (By.CSS_SELECTOR, ".MuiDataGrid-root .MuiCircularProgress-root")))
+
+        last_count = [-1]
+        empty_since = [None]
+
+        def row_count_stable(driver):
+            count = len(driver.find_elements(By.CLASS_NAME, "MuiDataGrid-row"))
+            if count == 0:
+                last_count[0] = count
+                if not driver.find_elements(By.CSS_SELECTOR, ".MuiDataGrid-overlay") \
+                        or driver.find_elements(By.CSS_SELECTOR, ".MuiDataGrid-root .MuiCircularProgress-root"):
+                    empty_since[0] = None
+                    return False
+                if empty_since[0] is None:
+                    empty_since[0] = time.monotonic()
+                return time.monotonic() - empty_since[0] >= empty_quiet_time
+
+            empty_since[0] = None
+            stable = count == last_count[0]
+            last_count[0] = count
+            return stable
 
-        # XPaths
-        self.year_xpath = "(//div[@role='combobox' and contains(@class, 'MuiSelect-select')])[3]"
-        self.state_xpath = "(//div[@role='combobox' and contains(@class, 'MuiSelect-select')])[4]"
-        self.district_xpath = "(//div[@role='combobox' and contains(@class, 'MuiSelect-select')])[5]"
-        self.block_xpath = "(//div[@role='combobox' and contains(@class, 'MuiSelect-select')])[6]"
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(row_count_stable)
+        except TimeoutException:
+            pass
+
+    def load_manifest(self):
+        """Load completed downloads from the manifest, seeding it from existing CSVs on first run"""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return {tuple(json.loads(line)) for line in f if line.strip()}
+
+        # No manifest yet: record the CSVs already on disk once
+        done = set()
+        suffix = f"_{self.nutrient_type.lower()}.csv"
+        for root, dirs, files in os.walk("data/raw"):
+            parts = os.path.relpath(root, "data/raw").split(os.sep)
+            if len(parts) != 3:
+                continue
+            for f in files:
+                if f.lower().endswith(suffix):
+                    done.add((*parts, f[:-len(suffix)]))
+
+        if done:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            with open(self.manifest_path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(list(key)) + "\n" for key in sorted(done))
+        return done
+
+    def mark_done(self, year, state, district, block):
+        """Record a completed download in memory and append it to the manifest"""
+        key = (year, state, district, block)
+        if key in self.done:
+            return
+        self.done.add(key)
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(list(key)) + "\n")
+        self.save_cursor(year, state, district, block)
+
+    def load_cursor(self):
+        """Load the checkpoint left by an interrupted run (None if there is none)"""
+        try:
+            with open(self.cursor_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_cursor(self, year, state, district, block):
+        """Checkpoint the last saved download; written to a temp file first so a crash never leaves it truncated"""
+        tmp_path = self.cursor_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"year": year, "state": state, "district": district, "block": block}, f)
+        os.replace(tmp_path, self.cursor_path)
+
+    def clear_cursor(self):
+        """Remove the checkpoint once a run has gone through every year"""
+        self.cursor = None
+        if os.path.exists(self.cursor_path):
+            os.remove(self.cursor_path)
 
     def should_skip_year(self, year_name):
         """Check if year should be skipped"""
@@ -42,27 +393,21 @@ class SoilHealthScraper:
         if year_name in self.skip_years:
             return True
 
-        # Check if data directory already exists for this year
-        year_data_path = f"data/raw/{year_name}"
-        if os.path.exists(year_data_path):
-            # Check if directory has substantial data (not empty)
-            if self.has_existing_data(year_data_path):
-                print(f"📁 [{self.nutrient_type}] Found existing data for {year_name}, skipping...")
-                return True
+        # A year the last run stopped in is unfinished, however many files it already has
+        if self.cursor and self.cursor["year"] == year_name:
+            return False
 
-        return False
+        # Check if the manifest already has data for this year
+        if self.has_existing_data(year_name):
+            self.logger.info(f"📁 [{self.nutrient_type}] Found existing data for {year_name}, skipping...")
+            return True
 
-    def has_existing_data(self, year_path):
-        """Check if year directory has existing CSV files"""
-        try:
-            csv_count = 0
-            for root, dirs, files in os.walk(year_path):
-                csv_count += len([f for f in files if f.endswith('.csv') and self.nutrient_type.lower() in f.lower()])
+        return False
 
-            # Consider it has data if there are at least 5 CSV files for this nutrient type
-            return csv_count >= 5
-        except Exception:
-            return False
+    def has_existing_data(self, year_name):
+        """Check if the manifest has completed downloads for this year"""
+        # Consider it has data if there are at least 5 CSV files for this nutrient type
+        return sum(1 for key in self.done if key[0] == year_name) >= 5
 
     def safe_click(self, el):
         try:
@@ -73,227 +418,410 @@ class SoilHealthScraper:
     def reset_page(self):
         """Reset the page to initial state"""
         try:
-            self.driver.refresh()
-            time.sleep(3)
+            # Clear client-side state instead of reloading the whole page
+            if not self._ensure_driver():
+                self.driver.delete_all_cookies()
+                self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
             # Re-select nutrient type
-            button_text = f"{self.nutrient_type}(Table View)"
-            button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, f"//button[contains(text(), '{button_text}')]")))
-            button.click()
-            time.sleep(2)
+            self.select_nutrient_type()
             return True
         except Exception as e:
-            print(f"⚠️  [{self.nutrient_type}] Page reset failed: {e}")
+            self.logger.warning(f"⚠️  [{self.nutrient_type}] Page reset failed: {e}")
             return False
 
-    def get_dropdown_options(self, xpath, retries=3):
+    def _backoff(self, attempt, base=0.25, cap=5.0):
+        """Sleep before a retry: exponential in the attempt number, with jitter"""
+        time.sleep(min(base * (2 ** attempt) + random.uniform(0, base), cap))
+
+    def get_dropdown_options(self, dropdown_index, retries=3):
         """Get dropdown options with retry logic - returns option texts instead of elements"""
+        stale_failures = 0
         for attempt in range(retries):
             try:
-                dropdown = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
+                dropdown = self._get_dropdown(dropdown_index)
                 self.safe_click(dropdown)
-                time.sleep(1)
-                options = self.wait.until(
+                self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, self.listbox_css)))
+                self.wait.until(
                     EC.presence_of_all_elements_located(
-                        (By.XPATH, "//ul[@role='listbox']/li[not(@aria-disabled='true')]")))
+                        (By.CSS_SELECTOR, self.option_css)))
 
-                # Extract text content immediately to avoid stale references
-                option_texts = []
-                for option in options:
-                    try:
-                        text = option.text.strip()
-                        if text:  # Only add non-empty options
-                            option_texts.append(text)
-                    except StaleElementReferenceException:
-                        continue
+                # Extract all option texts in one script call (no element references to go stale)
+                option_texts = self.driver.execute_script(self.option_texts_js)
 
                 # Close dropdown by clicking elsewhere
-                try:
-                    self.driver.find_element(By.TAG_NAME, "body").click()
-                    time.sleep(0.5)
-                except:
-                    pass
+                self.close_dropdown()
 
                 return option_texts
             except (TimeoutException, StaleElementReferenceException) as e:
-                print(f"⚠️  [{self.nutrient_type}] Attempt {attempt + 1} failed for dropdown: {e}")
+                self.logger.warning(f"⚠️  [{self.nutrient_type}] Attempt {attempt + 1} failed for dropdown: {e}")
+                stale_failures = stale_failures + 1 if isinstance(e, StaleElementReferenceException) else 0
                 if attempt < retries - 1:
-                    time.sleep(2)
-                    # Try refreshing page on final retry
-                    if attempt == retries - 2:
+                    self._backoff(attempt)
+                    # Reset the page before the final retry, but only if the DOM keeps going stale
+                    if attempt == retries - 2 and stale_failures >= 2:
                         self.reset_page()
                 else:
                     return []
         return []
 
-    def select_dropdown_by_text(self, xpath, target_text, max_retries=3):
+    def get_dropdown_options_cached(self, dropdown_index, key):
+        """Get dropdown options, reusing the texts already fetched for the same parent selection"""
+        if key not in self._opts_cache:
+            option_texts = self.get_dropdown_options(dropdown_index)
+            if not option_texts:
+                return option_texts  # Don't cache failures
+            self._opts_cache[key] = option_texts
+        return self._opts_cache[key]
+
+    def prune_options_cache(self, selection):
+        """Drop cached option lists that do not belong to the current (year, state, district) selection"""
+        self._opts_cache = {key: options for key, options in self._opts_cache.items()
+                            if key[:len(selection)] == selection[:len(key)]}
+
+    def select_dropdown_by_text(self, dropdown_index, target_text, max_retries=3):
         """Select dropdown option by text with retry logic"""
+        option_xpath = f"{self.listbox_xpath}/li[normalize-space(text())='{target_text}']"
         for attempt in range(max_retries):
             try:
-                dropdown = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
+                # Remember a current row (or the "No rows" overlay of an empty grid)
+                # so we can tell when the grid re-renders
+                rows = (self.driver.find_elements(By.CLASS_NAME, "MuiDataGrid-row")
+                        or self.driver.find_elements(By.CSS_SELECTOR, ".MuiDataGrid-overlay"))
+
+                dropdown = self._get_dropdown(dropdown_index)
                 self.safe_click(dropdown)
-                time.sleep(1)
+                self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, self.listbox_css)))
 
                 # Find and click the option with matching text
-                option_xpath = f"//ul[@role='listbox']/li[normalize-space(text())='{target_text}']"
                 option = self.wait.until(EC.element_to_be_clickable((By.XPATH, option_xpath)))
                 self.safe_click(option)
-                time.sleep(1)
+                self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, self.listbox_css)))
+
+                # Wait for the grid to update; an unchanged grid is not an error
+                if rows:
+                    try:
+                        WebDriverWait(self.driver, 3).until(EC.staleness_of(rows[0]))
+                    except TimeoutException:
+                        pass
                 return True
             except (StaleElementReferenceException, TimeoutException, NoSuchElementException) as e:
-                print(
+                self.logger.warning(
                     f"⚠️ [{self.nutrient_type}] Dropdown selection attempt {attempt + 1} failed for '{target_text}': {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(2)
+                    self._backoff(attempt)
                     # Try closing any open dropdowns
-                    try:
-                        self.driver.find_element(By.TAG_NAME, "body").click()
-                        time.sleep(0.5)
-                    except:
-                        pass
+                    self.close_dropdown()
         return False
 
     def scrape_table(self):
-        time.sleep(2)
+        """Return the table rows that hold any data; the full table is kept in self.last_table"""
+        self.last_table = None
         try:
             scroller = self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "MuiDataGrid-virtualScroller")))
-            rows = scroller.find_elements(By.CLASS_NAME, "MuiDataGrid-row")
+            self.wait_for_table()
+            # Read every cell in one script call instead of one round trip per cell
+            table = self.driver.execute_script(self.table_js, scroller)
+            headers, rows = table['headers'], table['rows']
+
+            # The grid virtualises rows and columns; the CSV can only be written from
+            # the page when every row (aria-rowcount includes the header row) and
+            # every column is rendered
+            complete = (table['rowCount'] > 0 and len(rows) >= table['rowCount'] - 1
+                        and len(headers) == table['colCount']
+                        and all(len(row) == len(headers) for row in rows))
+            self.last_table = {'headers': headers, 'rows': rows, 'complete': complete}
+
             data = []
-            for row in rows:
-                cells = row.find_elements(By.CLASS_NAME, "MuiDataGrid-cell")
-                row_data = [cell.text.strip() for cell in cells]
+            for row_data in rows:
                 if any(cell != "0" and cell != "" for cell in row_data):
                     data.append(row_data)
             return data
         except Exception as e:
-            print(f"⚠️ [{self.nutrient_type}] Table scraping failed: {e}")
+            self.logger.warning(f"⚠️ [{self.nutrient_type}] Table scraping failed: {e}")
             return []
 
-    def download_and_rename_csv(self, year, state, district, block):
+    def has_nonzero_data(self, rows):
+        """Check if any row holds a value other than 0, '' or '-' outside its first (label) column"""
+        return any(cell not in ("0", "", "-") for row in rows for cell in row[1:])
+
+    def save_table_csv(self, year, state, district, block, table):
+        """Write a fully rendered table straight to the raw data folder"""
+        directory = f"data/raw/{year}/{state}/{district}"
+        os.makedirs(directory, exist_ok=True)
+        new_file = os.path.join(directory, f"{block}_{self.nutrient_type.lower()}.csv")
+        with open(new_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(table['headers'])
+            writer.writerows(table['rows'])
+        self.mark_done(year, state, district, block)
+        self.logger.info(f"✅ [{self.nutrient_type}] Saved table: {new_file}")
+
+    def download_and_rename_csv(self, year, state, district, block, table=None):
+        """Save the current table as a CSV, using the scraped rows when complete and the site's export otherwise"""
+        if table is not None and table['complete']:
+            try:
+                self.save_table_csv(year, state, district, block, table)
+                return
+            except OSError as e:
+                self.logger.warning(f"⚠️ [{self.nutrient_type}] Writing scraped table failed, using export: {e}")
+
         try:
-            download_link = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, "//a[contains(text(),'Export to CSV')]")))
-            self.driver.execute_script("arguments[0].click();", download_link)
-            time.sleep(3)  # Increased wait time for download
-
-            download_folder = os.path.expanduser("~/Downloads")
-            downloaded_file = os.path.join(download_folder, "my-file.csv")
-
-            # Wait longer for download to complete
-            max_wait = 10
-            wait_count = 0
-            while not os.path.exists(downloaded_file) and wait_count < max_wait:
-                time.sleep(1)
-                wait_count += 1
-
-            if os.path.exists(downloaded_file):
-                directory = f"data/raw/{year}/{state}/{district}"
-                os.makedirs(directory, exist_ok=True)
-                new_file = os.path.join(directory, f"{block}_{self.nutrient_type.lower()}.csv")
-                shutil.move(downloaded_file, new_file)
-                print(f"✅ [{self.nutrient_type}] Downloaded and saved: {new_file}")
+            downloaded_file = self.export_csv()
+            if downloaded_file:
+                self.store_csv(downloaded_file, year, state, district, block)
             else:
-                print(f"⚠️ [{self.nutrient_type}] Downloaded file not found")
+                self.logger.warning(f"⚠️ [{self.nutrient_type}] Downloaded file not found")
         except Exception as e:
-            print(f"⚠️ [{self.nutrient_type}] CSV Download failed: {e}")
+            self.logger.warning(f"⚠️ [{self.nutrient_type}] CSV Download failed: {e}")
+
+    def export_csv(self):
+        """Click the site's Export to CSV and return the downloaded file's path (None if it never arrives)"""
+        download_link = self.wait.until(
+            EC.presence_of_element_located((By.XPATH, "//a[contains(text(),'Export to CSV')]")))
+
+        if self._download_observer is not None:
+            # Drop events left over from earlier exports, then block until the new file arrives
+            while not self._downloads.empty():
+                self._downloads.get_nowait()
+            self.driver.execute_script("arguments[0].click();", download_link)
+            try:
+                downloaded_name = self._downloads.get(timeout=13)
+            except queue.Empty:
+                return None
+            return os.path.join(self.download_dir, downloaded_name)
+
+        # Snapshot the download folder so the export is recognised whatever Chrome names it
+        existing_files = set(os.listdir(self.download_dir))
+        self.driver.execute_script("arguments[0].click();", download_link)
+
+        def new_download(driver):
+            # In-progress downloads end in .crdownload until Chrome renames them
+            new_files = [f for f in os.listdir(self.download_dir)
+                         if f.endswith('.csv') and f not in existing_files]
+            return new_files[0] if new_files else False
+
+        try:
+            downloaded_name = WebDriverWait(self.driver, 13, poll_frequency=0.05).until(new_download)
+        except TimeoutException:
+            return None
+        return os.path.join(self.download_dir, downloaded_name)
+
+    def store_csv(self, downloaded_file, year, state, district, block):
+        """Move a downloaded export into the raw data folder and record it in the manifest"""
+        directory = f"data/raw/{year}/{state}/{district}"
+        os.makedirs(directory, exist_ok=True)
+        new_file = os.path.join(directory, f"{block}_{self.nutrient_type.lower()}.csv")
+        shutil.move(downloaded_file, new_file)
+        self.mark_done(year, state, district, block)
+        self.logger.info(f"✅ [{self.nutrient_type}] Downloaded and saved: {new_file}")
+
+    def scrape_block(self, year_name, state_name, district_name, block_name):
+        """
+        Select a block in this browser, navigating to its district first if needed, and capture its data
+
+        Returns:
+            ('table', table) when the grid is fully rendered, ('exported', path) when the
+            site's export was downloaded, ('empty', None) or ('failed', None)
+        """
+        if self._ensure_driver():
+            self.select_nutrient_type()
+
+        selection = (year_name, state_name, district_name)
+        if self._selection != selection:
+            self._selection = None
+            for dropdown_index, text in zip((self.year_dropdown, self.state_dropdown, self.district_dropdown),
+                                            selection):
+                if not self.select_dropdown_by_text(dropdown_index, text):
+                    return 'failed', None
+            self._selection = selection
+
+        if not self.select_dropdown_by_text(self.block_dropdown, block_name):
+            return 'failed', None
+        if not self.scrape_table():
+            return 'empty', None
+        if self.last_table['complete']:
+            return 'table', self.last_table
+
+        downloaded_file = self.export_csv()
+        return ('exported', downloaded_file) if downloaded_file else ('failed', None)
+
+    def scrape_blocks_parallel(self, year_name, state_name, district_name, clean_state_name, clean_district_name,
+                               block_options):
+        """Scrape a district's blocks in the block worker pool and save the results from this process"""
+        tasks = []
+        for block_name in block_options:
+            clean_block_name = block_name.translate(self._name_trans)
+            # Resume: skip blocks already downloaded in an earlier run
+            if (year_name, clean_state_name, clean_district_name, clean_block_name) in self.done:
+                self.logger.info(f"    ⏭️ [{self.nutrient_type}] Already downloaded block: {block_name}")
+                continue
+            tasks.append((year_name, state_name, district_name, block_name))
+
+        if not tasks:
+            return
+
+        if self._block_pool is None:
+            self._block_pool = multiprocessing.Pool(
+                processes=self.block_workers, initializer=_init_block_worker,
+                initargs=(self.nutrient_type, self.headless, self.log_queue))
+
+        for block_name, status, result in self._block_pool.imap_unordered(_scrape_block, tasks):
+            clean_block_name = block_name.translate(self._name_trans)
+            try:
+                if status == 'table':
+                    self.save_table_csv(year_name, clean_state_name, clean_district_name, clean_block_name, result)
+                elif status == 'exported':
+                    self.store_csv(result, year_name, clean_state_name, clean_district_name, clean_block_name)
+                elif status == 'empty':
+                    self.logger.info(f"    ⏭️ [{self.nutrient_type}] No data found for block: {block_name}")
+                else:
+                    self.logger.warning(
+                        f"    ⚠️ [{self.nutrient_type}] Block processing failed for {block_name}: {result}")
+            except OSError as e:
+                self.logger.warning(f"    ⚠️ [{self.nutrient_type}] Saving block {block_name} failed: {e}")
 
     def start_scraping(self):
         """Main scraping logic with improved stale element handling"""
         try:
             # Select nutrient type
-            button_text = f"{self.nutrient_type}(Table View)"
-            button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, f"//button[contains(text(), '{button_text}')]")))
-            button.click()
-            time.sleep(2)
-            print(f"🚀 [{self.nutrient_type}] Started scraping")
+            self._ensure_driver()
+            self.select_nutrient_type()
+            self.logger.info(f"🚀 [{self.nutrient_type}] Started scraping")
         except Exception as e:
-            print(f"⚠️ [{self.nutrient_type}] Failed to select {button_text}: {e}")
-            self.driver.quit()
+            self.logger.warning(f"⚠️ [{self.nutrient_type}] Failed to select {self.nutrient_type}(Table View): {e}")
+            self.close()
             return
 
         try:
             # Get all year options as text
-            year_options = self.get_dropdown_options(self.year_xpath)
+            year_options = self.get_dropdown_options_cached(self.year_dropdown, ())
             if not year_options:
-                print(f"❌ [{self.nutrient_type}] No year options found")
-                self.driver.quit()
+                self.logger.error(f"❌ [{self.nutrient_type}] No year options found")
+                self.close()
                 return
 
-            print(f"📅 [{self.nutrient_type}] Found {len(year_options)} years: {year_options}")
+            self.logger.info(f"📅 [{self.nutrient_type}] Found {len(year_options)} years: {year_options}")
 
-            for year_index, year_name in enumerate(year_options):
+            year_progress = tqdm(year_options, desc=self.nutrient_type, unit="year", position=self.progress_position)
+            for year_index, year_name in enumerate(year_progress):
                 # Check if year should be skipped
                 if self.should_skip_year(year_name):
-                    print(f"⏭️ [{self.nutrient_type}] Skipping year: {year_name} (already processed or in skip list)")
+                    self.logger.info(
+                        f"⏭️ [{self.nutrient_type}] Skipping year: {year_name} (already processed or in skip list)")
                     continue
 
+                # Reuse the browser across years; only a lost session needs a new one
+                if self._ensure_driver():
+                    self.select_nutrient_type()
+
                 # Always reselect year from fresh dropdown to ensure we're on the right year
-                print(f"\n📅 [{self.nutrient_type}] Selecting Year: {year_name} ({year_index + 1}/{len(year_options)})")
+                self.logger.info(
+                    f"📅 [{self.nutrient_type}] Selecting Year: {year_name} ({year_index + 1}/{len(year_options)})")
 
                 # Get fresh year options and select by text
-                current_year_options = self.get_dropdown_options(self.year_xpath)
+                current_year_options = self.get_dropdown_options_cached(self.year_dropdown, ())
                 if not current_year_options or year_name not in current_year_options:
-                    print(f"⚠️ [{self.nutrient_type}] Year {year_name} not available in fresh dropdown")
+                    self.logger.warning(f"⚠️ [{self.nutrient_type}] Year {year_name} not available in fresh dropdown")
                     continue
 
-                if not self.select_dropdown_by_text(self.year_xpath, year_name):
-                    print(f"⚠️ [{self.nutrient_type}] Failed to select year: {year_name}")
+                if not self.select_dropdown_by_text(self.year_dropdown, year_name):
+                    self.logger.warning(f"⚠️ [{self.nutrient_type}] Failed to select year: {year_name}")
                     continue
 
-                print(f"✅ [{self.nutrient_type}] Successfully selected Year: {year_name}")
+                self.logger.info(f"✅ [{self.nutrient_type}] Successfully selected Year: {year_name}")
+                self.prune_options_cache((year_name,))
+
+                # Probe the all-India table first: a year whose rows are all zero has nothing below it.
+                # An empty grid is not conclusive (the page may need a state first), so only skip on zeros
+                self.scrape_table()
+                if self.last_table and self.last_table['rows'] and not self.has_nonzero_data(self.last_table['rows']):
+                    self.logger.info(f"⏭️ [{self.nutrient_type}] Skipping year: {year_name} — all-zero table")
+                    continue
 
                 # Get fresh state options for this year
-                state_options = self.get_dropdown_options(self.state_xpath)
+                state_options = self.get_dropdown_options_cached(self.state_dropdown, (year_name,))
                 if not state_options:
-                    print(f"⏭️ [{self.nutrient_type}] No states found for year {year_name}")
+                    self.logger.info(f"⏭️ [{self.nutrient_type}] No states found for year {year_name}")
                     continue
 
-                print(f"🏛️ [{self.nutrient_type}] Found {len(state_options)} states for {year_name}")
+                self.logger.info(f"🏛️ [{self.nutrient_type}] Found {len(state_options)} states for {year_name}")
+
+                # Resuming in this year: states before the checkpoint were finished by the last run
+                resume = self.cursor if self.cursor and self.cursor["year"] == year_name else None
+                if resume and resume["state"] not in [s.translate(self._name_trans) for s in state_options]:
+                    resume = None
 
                 for state_index, state_name in enumerate(state_options):
                     # Clean state name for file system
-                    clean_state_name = state_name.replace("/", "-").replace(" ", "_")
+                    clean_state_name = state_name.translate(self._name_trans)
+
+                    if resume:
+                        if clean_state_name != resume["state"]:
+                            self.logger.info(
+                                f"⏭️ [{self.nutrient_type}] Skipping state: {state_name} — done before checkpoint")
+                            continue
+                        resume_district = resume["district"]
+                        resume = None
+                    else:
+                        resume_district = None
 
                     # Select state by text
-                    if not self.select_dropdown_by_text(self.state_xpath, state_name):
-                        print(f"⚠️ [{self.nutrient_type}] Failed to select state: {state_name}")
+                    if not self.select_dropdown_by_text(self.state_dropdown, state_name):
+                        self.logger.warning(f"⚠️ [{self.nutrient_type}] Failed to select state: {state_name}")
                         continue
 
-                    print(f"\n🏛️ [{self.nutrient_type}] Processing state: {state_name}")
+                    self.logger.info(f"🏛️ [{self.nutrient_type}] Processing state: {state_name}")
+                    self.prune_options_cache((year_name, state_name))
 
                     # Check if entire state is empty
                     state_data = self.scrape_table()
                     if not state_data:
-                        print(f"⏭️ [{self.nutrient_type}] Skipping state: {state_name} — empty table")
+                        self.logger.info(f"⏭️ [{self.nutrient_type}] Skipping state: {state_name} — empty table")
+                        continue
+                    if not self.has_nonzero_data(state_data):
+                        self.logger.info(f"⏭️ [{self.nutrient_type}] Skipping state: {state_name} — all-zero table")
                         continue
 
                     # Get district options
-                    district_options = self.get_dropdown_options(self.district_xpath)
+                    district_options = self.get_dropdown_options_cached(self.district_dropdown, (year_name, state_name))
                     if not district_options:
-                        print(f"⏭️ [{self.nutrient_type}] No districts found for state {state_name}")
+                        self.logger.info(f"⏭️ [{self.nutrient_type}] No districts found for state {state_name}")
                         continue
 
-                    print(f"📍 [{self.nutrient_type}] Found {len(district_options)} districts for {state_name}")
+                    self.logger.info(
+                        f"📍 [{self.nutrient_type}] Found {len(district_options)} districts for {state_name}")
                     valid_district_found = False
 
+                    if resume_district not in [d.translate(self._name_trans) for d in district_options]:
+                        resume_district = None
+
                     for district_index, district_name in enumerate(district_options):
                         try:
                             # Clean district name for file system
-                            clean_district_name = district_name.replace("/", "-").replace(" ", "_")
+                            clean_district_name = district_name.translate(self._name_trans)
+
+                            if resume_district:
+                                if clean_district_name != resume_district:
+                                    self.logger.info(
+                                        f"  ⏭️ [{self.nutrient_type}] Skipping district {district_name} — done before checkpoint")
+                                    continue
+                                resume_district = None
 
-                            print(
+                            self.logger.info(
                                 f"  📍 [{self.nutrient_type}] Processing district: {district_name} ({district_index + 1}/{len(district_options)} in {state_name})")
 
                             # Select district by text (year and state are already selected)
-                            if not self.select_dropdown_by_text(self.district_xpath, district_name):
-                                print(f"    ⚠️ [{self.nutrient_type}] Failed to select district: {district_name}")
+                            if not self.select_dropdown_by_text(self.district_dropdown, district_name):
+                                self.logger.warning(
+                                    f"    ⚠️ [{self.nutrient_type}] Failed to select district: {district_name}")
                                 continue
+                            self.prune_options_cache((year_name, state_name, district_name))
 
                             # Check if district has any data first
                             district_data = self.scrape_table()
                             if not district_data:
-                                print(f"  ⏭️ [{self.nutrient_type}] Skipping district {district_name} — no data found")
+                                self.logger.info(
+                                    f"  ⏭️ [{self.nutrient_type}] Skipping district {district_name} — no data found")
                                 continue
 
                             # District has data, mark as valid
@@ -301,72 +829,126 @@ class SoilHealthScraper:
 
                             # Check if this is specifically "All Districts" option
                             if district_name in ["All_Districts", "All Districts"]:
-                                print(f"  📊 [{self.nutrient_type}] Found 'All Districts' option: {district_name}")
-                                print(f"  ⬇️ [{self.nutrient_type}] Downloading aggregated CSV and skipping blocks")
+                                self.logger.info(
+                                    f"  📊 [{self.nutrient_type}] Found 'All Districts' option: {district_name}")
+                                self.logger.info(
+                                    f"  ⬇️ [{self.nutrient_type}] Downloading aggregated CSV and skipping blocks")
                                 self.download_and_rename_csv(year_name, clean_state_name, clean_district_name,
-                                                             "AllDistricts")
+                                                             "AllDistricts", self.last_table)
                                 continue  # Skip block processing and move to next district
 
                             # Try to get block options for regular districts
-                            block_options = self.get_dropdown_options(self.block_xpath)
+                            block_options = self.get_dropdown_options_cached(
+                                self.block_dropdown, (year_name, state_name, district_name))
 
                             if not block_options:
-                                print(
+                                self.logger.info(
                                     f"  ⏭️ [{self.nutrient_type}] No blocks for {district_name} — saving district-level CSV")
                                 self.download_and_rename_csv(year_name, clean_state_name, clean_district_name,
-                                                             "NoBlock")
+                                                             "NoBlock", self.last_table)
                                 continue
 
-                            print(f"  🏘️ [{self.nutrient_type}] Found {len(block_options)} blocks for {district_name}")
+                            self.logger.info(
+                                f"  🏘️ [{self.nutrient_type}] Found {len(block_options)} blocks for {district_name}")
+
+                            # Hand the blocks to the worker browsers when a block pool is configured
+                            if self.block_workers > 1 and len(block_options) > 1:
+                                self.scrape_blocks_parallel(year_name, state_name, district_name, clean_state_name,
+                                                            clean_district_name, block_options)
+                                continue
 
                             # Process each block (only for regular districts)
                             for block_index, block_name in enumerate(block_options):
                                 try:
                                     # Clean block name for file system
-                                    clean_block_name = block_name.replace("/", "-").replace(" ", "_")
+                                    clean_block_name = block_name.translate(self._name_trans)
 
-                                    print(
+                                    # Resume: skip blocks already downloaded in an earlier run
+                                    if (year_name, clean_state_name, clean_district_name, clean_block_name) in self.done:
+                                        self.logger.info(
+                                            f"    ⏭️ [{self.nutrient_type}] Already downloaded block: {block_name}")
+                                        continue
+
+                                    self.logger.info(
                                         f"    🏘️ [{self.nutrient_type}] Processing block: {block_name} ({block_index + 1}/{len(block_options)} in {district_name})")
 
                                     # Select block by text (year, state, and district are already selected)
-                                    if not self.select_dropdown_by_text(self.block_xpath, block_name):
-                                        print(f"      ⚠️ [{self.nutrient_type}] Failed to select block: {block_name}")
+                                    if not self.select_dropdown_by_text(self.block_dropdown, block_name):
+                                        self.logger.warning(
+                                            f"      ⚠️ [{self.nutrient_type}] Failed to select block: {block_name}")
                                         continue
 
                                     data = self.scrape_table()
                                     if data:
                                         self.download_and_rename_csv(year_name, clean_state_name, clean_district_name,
-                                                                     clean_block_name)
+                                                                     clean_block_name, self.last_table)
                                     else:
-                                        print(f"    ⏭️ [{self.nutrient_type}] No data found for block: {block_name}")
+                                        self.logger.info(
+                                            f"    ⏭️ [{self.nutrient_type}] No data found for block: {block_name}")
 
                                 except Exception as e:
-                                    print(f"    ⚠️ [{self.nutrient_type}] Block processing error for {block_name}: {e}")
+                                    self.logger.warning(
+                                        f"    ⚠️ [{self.nutrient_type}] Block processing error for {block_name}: {e}")
                                     continue
 
                         except Exception as e:
-                            print(f"  ⚠️ [{self.nutrient_type}] District processing error for {district_name}: {e}")
+                            self.logger.warning(
+                                f"  ⚠️ [{self.nutrient_type}] District processing error for {district_name}: {e}")
                             continue
 
                     if not valid_district_found:
-                        print(f"⏭️ [{self.nutrient_type}] No valid data found for state: {state_name}")
+                        self.logger.info(f"⏭️ [{self.nutrient_type}] No valid data found for state: {state_name}")
+
+                    self.logger.info(f"✅ [{self.nutrient_type}] Finished state: {state_name}")
 
-                    print(f"✅ [{self.nutrient_type}] Finished state: {state_name}")
+                self.logger.info(f"✅ [{self.nutrient_type}] Finished year: {year_name}")
 
-                print(f"✅ [{self.nutrient_type}] Finished year: {year_name}")
+            # Every year was visited, so the next run starts from the top again
+            self.clear_cursor()
 
         except Exception as e:
-            print(f"❌ [{self.nutrient_type}] Critical error in main loop: {e}")
-            import traceback
-            traceback.print_exc()
+            self.logger.exception(f"❌ [{self.nutrient_type}] Critical error in main loop: {e}")
         finally:
-            print(f"\n🏁 [{self.nutrient_type}] Scraping completed. Closing browser...")
-            self.driver.quit()
-
-
-def run_scraper(nutrient_type, chrome_port, skip_years=None):
-    """Function to run scraper in a thread"""
-    scraper = SoilHealthScraper(nutrient_type, chrome_port, skip_years)
+            self.logger.info(f"🏁 [{self.nutrient_type}] Scraping completed. Closing browser...")
+            self.close()
+
+
+def start_log_listener(log_file="scrape.log"):
+    """
+    Collect log records from all scraper processes in the main process
+
+    Everything at INFO and above goes to a rotating log file; only errors reach
+    the console, which is left to the progress bars.
+
+    Returns:
+        Tuple of (queue for the scraper processes, started QueueListener)
+    """
+    file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=10_000_000, backupCount=3,
+                                                        encoding='utf-8')
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(processName)s - %(levelname)s - %(message)s'))
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.ERROR)
+    console_handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
+
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler,
+                                              respect_handler_level=True)
+    listener.start()
+    return log_queue, listener
+
+
+def run_scraper(nutrient_type, chrome_port, skip_years=None, log_queue=None, progress_position=0, block_workers=1):
+    """Function to run scraper in its own process"""
+    if log_queue is not None:
+        # Hand records to the listener in the main process instead of writing from here
+        root_logger = logging.getLogger()
+        root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+        root_logger.setLevel(logging.INFO)
+
+    scraper = SoilHealthScraper(nutrient_type, chrome_port, skip_years, progress_position=progress_position,
+                                block_workers=block_workers, log_queue=log_queue)
     scraper.start_scraping()
 
 
@@ -376,16 +958,25 @@ if __name__ == "__main__":
     # Define years to skip (modify as needed)
     years_to_skip = ["2025-26"]  # Add more years as needed: ["2025-26", "2024-25"]
 
-    # Create threads for both scrapers with skip_years parameter
-    macro_thread = threading.Thread(target=run_scraper, args=("MacroNutrient", 9222, years_to_skip))
-    micro_thread = threading.Thread(target=run_scraper, args=("MicroNutrient", 9223, years_to_skip))
-
-    # Start both threads
-    macro_thread.start()
-    micro_thread.start()
-
-    # Wait for both threads to complete
-    macro_thread.join()
-    micro_thread.join()
+    # One process per nutrient type: each scraper drives its own Chrome instance
+    scraper_jobs = [
+        ("MacroNutrient", 9222, years_to_skip),
+        ("MicroNutrient", 9223, years_to_skip),
+    ]
+    log_queue, log_listener = start_log_listener()
+    processes = [multiprocessing.Process(target=run_scraper, args=(*job, log_queue, position), name=job[0])
+                 for position, job in enumerate(scraper_jobs)]
+
+    # Start all scrapers
+    for process in processes:
+        process.start()
+
+    # Wait for all scrapers to complete
+    for process in processes:
+        process.join()
+        if process.exitcode != 0:
+            print(f"⚠️ [{process.name}] Scraper process exited with code {process.exitcode}")
+
+    log_listener.stop()
 
     print("🎉 Both scrapers completed!")
\ No newline at end of file
@@ -0,0 +1,209 @@
+import pandas as pd
+import pytest
+
+from consolidate_data import SoilDataConsolidator
+
+MACRO_HEADER = 'Village,Farmer Name,Sample ID,pH,EC,OC,N,P,K'
+
+
+def write_csv(raw_dir, block, header, rows, nutrient='macronutrient'):
+    """Write a raw CSV at YEAR/STATE/DISTRICT/<block>_<nutrient>.csv"""
+    path = raw_dir / '2023-24' / 'State_A' / 'District_X' / f'{block}_{nutrient}.csv'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('\n'.join([header, *rows]) + '\n', encoding='utf-8')
+    return path
+
+
+def process(consolidator, nutrient_type, batched, monkeypatch):
+    """Run process_nutrient_files through the batched scan or the per-file path"""
+    if not batched:
+        monkeypatch.setattr(consolidator, 'read_nutrient_files', lambda *args: None)
+    files = consolidator.find_csv_files()[nutrient_type]
+    df = consolidator.process_nutrient_files(sorted(files), nutrient_type, 'run')
+    monkeypatch.undo()
+    return df
+
+
+def normalize(df):
+    """Order columns and rows so both paths can be compared"""
+    df = df[sorted(df.columns)]
+    df = df.astype({col: str for col in df.columns if not pd.api.types.is_float_dtype(df[col])})
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def assert_paths_agree(consolidator, monkeypatch, nutrient_type='macro'):
+    batched = process(consolidator, nutrient_type, True, monkeypatch)
+    per_file = process(consolidator, nutrient_type, False, monkeypatch)
+    pd.testing.assert_frame_equal(normalize(batched), normalize(per_file))
+    return batched
+
+
+@pytest.fixture
+def consolidator(tmp_path):
+    return SoilDataConsolidator(raw_data_path=str(tmp_path / 'raw'),
+                                processed_data_path=str(tmp_path / 'processed'), max_workers=1)
+
+
+def test_batched_scan_matches_per_file(consolidator, monkeypatch):
+    raw = consolidator.raw_data_path
+    write_csv(raw, 'Block_One', MACRO_HEADER, [
+        'Alpha,Ram,1,6.5,0.2,0.4,120,15,200',
+        'Beta,Shyam,2,7.1,0.3,0.5,-5,12,180',
+    ])
+    write_csv(raw, 'Block_Two', MACRO_HEADER, [
+        'Gamma,Sita,3,15.2,0.1,0.3,140,n/a,210',
+        'Delta,Gita,4,5.9,0.2,0.6,"1,050",18,-',
+    ])
+
+    df = assert_paths_agree(consolidator, monkeypatch)
+
+    assert len(df) == 4
+    assert set(df['block']) == {'Block One', 'Block Two'}
+    assert df['ph'].isna().sum() == 1
+    assert df['nitrogen'].isna().sum() == 1
+    assert df.loc[df['farmer_name'] == 'Gita', 'nitrogen'].item() == 1050
+
+
+def test_consolidate_all_data(consolidator):
+    raw = consolidator.raw_data_path
+    write_csv(raw, 'Block_One', MACRO_HEADER, ['Alpha,Ram,1,6.5,0.2,0.4,120,15,200'])
+    write_csv(raw, 'Block_One', 'Village,Farmer Name,Sample ID,Fe,Zn',
+              ['Alpha,Ram,1,4.1,0.8'], nutrient='micronutrient')
+
+    df, summary = consolidator.consolidate_all_data()
+
+    assert len(df) == 1
+    assert df['iron'].item() == 4.1
+    assert df['nitrogen'].item() == 120
+    assert summary['total_unique_farmers'] == 1
+
+
+def test_variant_headers_share_one_column(consolidator, monkeypatch):
+    raw = consolidator.raw_data_path
+    write_csv(raw, 'Block_One', MACRO_HEADER, ['Alpha,Ram,1,6.5,0.2,0.4,120,15,200'])
+    write_csv(raw, 'Block_Two', 'village_name,farmer_name,Sample_ID,PH,ec,oc,Nitrogen,Phosphorus,Potassium',
+              ['Gamma,Sita,S-3,7.2,0.1,0.3,140 kg,11,210'])
+
+    df = assert_paths_agree(consolidator, monkeypatch)
+
+    assert not df.columns.duplicated().any()
+    assert not any(col.endswith('_1') for col in df.columns)
+    assert df['farmer_name'].tolist() == ['Ram', 'Sita']
+    assert df['sample_id'].astype(str).tolist() == ['1', 'S-3']
+    assert df['nitrogen'].tolist() == [120, 140]
+
+
+def test_header_variants_within_one_file(consolidator, monkeypatch):
+    raw = consolidator.raw_data_path
+    write_csv(raw, 'Block_One', 'Village,Farmer Name,farmer_name,pH,N,Nitrogen', [
+        'Alpha,Ram,,6.5,120,',
+        'Beta,,Shyam,7.1,,95',
+    ])
+
+    df = assert_paths_agree(consolidator, monkeypatch)
+
+    assert list(df.columns).count('nitrogen') == 1
+    assert df['farmer_name'].tolist() == ['Ram', 'Shyam']
+    assert df['nitrogen'].tolist() == [120, 95]
+
+    df, summary = consolidator.consolidate_all_data()
+    assert summary['total_unique_farmers'] == 2
+
+
+def test_ragged_file_falls_back_to_per_file(consolidator):
+    raw = consolidator.raw_data_path
+    write_csv(raw, 'Block_One', MACRO_HEADER, ['Alpha,Ram,1,6.5,0.2,0.4,120,15,200'])
+    rows = [f'V{i},F{i},{i},6.5,0.2,0.4,100,10,150' for i in range(20)]
+    write_csv(raw, 'Block_Two', MACRO_HEADER, [*rows, 'Z,Z,1,2,3,4,5,6,7,8,9'])
+
+    # The sniffer would take the ragged row as header; the batch is rejected instead
+    file_paths = sorted(path for path, _ in consolidator.find_csv_files()['macro'])
+    assert consolidator.read_nutrient_files(file_paths, consolidator.processed_data_path) is None
+
+    df = consolidator.process_nutrient_files(sorted(consolidator.find_csv_files()['macro']), 'macro', 'run')
+    # As in per-file processing, the malformed file is skipped and no junk columns appear
+    assert df['farmer_name'].tolist() == ['Ram']
+    assert set(df.columns) <= set(consolidator.column_dtypes) | {'nutrient_type', 'source_file', 'processed_date'}
+
+
+def test_garbled_values_reparsed_in_both_paths(tmp_path, monkeypatch):
+    consolidator = SoilDataConsolidator(raw_data_path=str(tmp_path / 'raw'),
+                                        processed_data_path=str(tmp_path / 'processed'),
+                                        max_workers=1, use_numba=True)
+    raw = consolidator.raw_data_path
+    # Mostly garbled: re-parsed
+    write_csv(raw, 'Block_One', 'Farmer Name,pH,N', [
+        'Ram,6.5,5-10',
+        'Shyam,7.1,1.2.3',
+        'Sita,6.0,१२०',
+        'Gita,5.5,7',
+        'Hari,6.2,-5-6',
+    ])
+    # Fully garbled file next to a large clean one: the threshold is checked per file
+    write_csv(raw, 'Block_Two', 'Farmer Name,pH,N', [f'A{i},6.5,5-10' for i in range(5)])
+    write_csv(raw, 'Block_Three', 'Farmer Name,pH,N', [f'B{i},6.5,{i} kg' for i in range(100)])
+    # Below the threshold: left as NaN
+    write_csv(raw, 'Block_Four', 'Farmer Name,pH,N', ['C0,6.5,5-10', *[f'C{i},6.5,{i}' for i in range(1, 10)]])
+
+    df = assert_paths_agree(consolidator, monkeypatch)
+    nitrogen = df.set_index('farmer_name')['nitrogen']
+
+    assert nitrogen[['Ram', 'Shyam', 'Sita', 'Gita']].tolist() == [5, 1.2, 120, 7]
+    assert pd.isna(nitrogen['Hari'])
+    assert (nitrogen[[f'A{i}' for i in range(5)]] == 5).all()
+    assert nitrogen['B42'] == 42
+    assert pd.isna(nitrogen['C0'])
+    assert 'nitrogen__raw' not in df.columns
+
+
+def test_latin1_file_is_not_reported_as_non_numeric(consolidator, caplog):
+    path = write_csv(consolidator.raw_data_path, 'Block_One', 'Farmer Name,pH,N', [])
+    path.write_bytes('Farmer Name,pH,N\nJosé,6.5,120\n'.encode('latin-1'))
+
+    with caplog.at_level('INFO'):
+        df = consolidator.process_single_file(path, 'macro', 'run')
+
+    assert df['farmer_name'].tolist() == ['José']
+    assert df['nitrogen'].tolist() == [120]
+    assert 'Non-numeric values' not in caplog.text
+
+
+def old_outer_merge(macro_df, micro_df, keys):
+    """combine_macro_micro_data before combine_first: outer merge, macro values preferred"""
+    combined_df = pd.merge(macro_df, micro_df, on=keys, how='outer', suffixes=('_macro', '_micro'))
+    for col in combined_df.columns:
+        if col.endswith('_macro') or col.endswith('_micro'):
+            base_col = col.replace('_macro', '').replace('_micro', '')
+            macro_col, micro_col = f"{base_col}_macro", f"{base_col}_micro"
+            if macro_col in combined_df.columns and micro_col in combined_df.columns:
+                combined_df[base_col] = combined_df[macro_col].fillna(combined_df[micro_col])
+                combined_df = combined_df.drop([macro_col, micro_col], axis=1)
+    return combined_df
+
+
+def test_combine_with_duplicate_keys_matches_outer_merge(consolidator):
+    keys = ['year', 'state', 'district', 'block', 'village']
+    location = {'year': '2023-24', 'state': 'State A', 'district': 'District X', 'block': 'Block One'}
+    macro_df = pd.DataFrame({
+        **location,
+        'village': ['Alpha', 'Alpha', 'Beta', 'Gamma'],
+        'ph': [6.5, 7.1, None, 5.9],
+        'nitrogen': [120.0, 95.0, 80.0, None],
+        'nutrient_type': 'macro',
+        'source_file': 'macro.csv',
+    })
+    micro_df = pd.DataFrame({
+        **location,
+        'village': ['Alpha', 'Alpha', 'Beta', 'Delta'],
+        'ph': [None, 6.8, 6.2, 7.4],
+        'iron': [4.1, 3.9, None, 2.2],
+        'nutrient_type': 'micro',
+        'source_file': 'micro.csv',
+    })
+
+    combined = consolidator.combine_macro_micro_data(macro_df, micro_df)
+    expected = old_outer_merge(macro_df, micro_df, keys)
+
+    # Alpha matches twice on each side
+    assert len(combined) == 2 * 2 + 1 + 1 + 1
+    pd.testing.assert_frame_equal(combined, expected)